@@ -1,11 +1,204 @@
+import argparse
 import heapq
-import os
+import io
+import re
 from collections import deque
-from typing import List, Tuple, Optional, Set, Dict
+from functools import lru_cache
+from itertools import repeat
+from typing import List, Tuple, Optional, Dict, TextIO
 import time
-import copy
 import sys
 
+# Kode byte untuk simbol dinding pada grid datar
+_WALL = ord('W')
+
+# Tabel str.translate untuk canvas blueprint: S/R/T tetap, dinding -> '█', sisanya -> '·'
+_CANVAS_TABLE = {i: ('█' if chr(i) == 'W' else chr(i) if chr(i) in 'SRT' else '·') for i in range(128)}
+
+# Simbol yang perlu dicatat posisinya saat memindai grid
+_MARKER_RE = re.compile(rb'[SRT]')
+_MARKER_CODES = b'SRT'
+
+# Keterangan jenis sel pada daftar koordinat jalur, berdasarkan kode byte
+_CELL_DESCRIPTIONS = {
+    ord('S'): " [Sumber AC]",
+    ord('R'): " [Ruangan Tujuan]",
+    ord('T'): " [Tangga/Lift]"
+}
+
+# Tabel bytes.translate: dinding -> 1, sel lain -> 0
+_WALL_MASK_TABLE = bytes(1 if i == _WALL else 0 for i in range(256))
+
+
+class _MapCharTable(dict):
+    """Tabel str.translate yang menghapus semua karakter selain simbol denah"""
+    def __missing__(self, key):
+        return None
+
+# Karakter ASCII sudah dipetakan langsung, sisanya ditangani __missing__
+_MAP_CHAR_TABLE = _MapCharTable({i: (i if chr(i) in 'SRTW.' else None) for i in range(128)})
+
+
+@lru_cache(maxsize=None)
+def _make_bfs_kernel(offsets: Tuple[int, int, int, int]):
+    """
+    Membuat kernel BFS khusus untuk satu ukuran grid pencarian. Keempat selisih indeks
+    tetangga menjadi konstanta closure sehingga pengecekan tetangga bisa ditulis langsung
+    tanpa perulangan. Kernel yang sama dipakai ulang untuk gedung berukuran sama.
+    """
+    up, down, left, right = offsets
+    
+    def _bfs_kernel(wall_mask: bytes, source_idx: int, target_mask: bytes,
+                    stair_links: Dict[int, List[int]]) -> List[int]:
+        """
+        Inti BFS pada grid pencarian berbingkai (wall_mask: 1 = dinding, 0 = dapat dilalui).
+        Seluruh node berupa indeks integer sehingga tidak ada tuple yang dibuat selama
+        penelusuran. Karena setiap lantai dikelilingi dinding, tetangga cukup dicek lewat
+        mask tanpa pemeriksaan batas. Penelusuran berhenti begitu semua sel bertanda 1
+        di target_mask sudah dikeluarkan dari antrian.
+        Mengembalikan parent untuk setiap sel (-1 = tidak terjangkau, sumber menunjuk dirinya sendiri).
+        """
+        parent = [-1] * len(wall_mask)
+        parent[source_idx] = source_idx
+        # Penanda sel yang tidak boleh dikunjungi lagi, disalin dari mask dinding
+        # sehingga satu pengecekan sudah mencakup dinding dan sel yang sudah dikunjungi
+        visited = bytearray(wall_mask)
+        visited[source_idx] = 1
+        
+        remaining = target_mask.count(1)
+        
+        queue = deque([source_idx])
+        append, popleft = queue.append, queue.popleft
+        
+        while queue:
+            idx = popleft()
+            if target_mask[idx]:
+                remaining -= 1
+                if not remaining:
+                    break # Semua target sudah memiliki jalur terpendek
+            
+            # Opsi 1: Pergerakan horizontal di lantai yang sama (atas, bawah, kiri, kanan)
+            new_idx = idx + up
+            if not visited[new_idx]:
+                visited[new_idx] = 1
+                parent[new_idx] = idx
+                append(new_idx)
+            new_idx = idx + down
+            if not visited[new_idx]:
+                visited[new_idx] = 1
+                parent[new_idx] = idx
+                append(new_idx)
+            new_idx = idx + left
+            if not visited[new_idx]:
+                visited[new_idx] = 1
+                parent[new_idx] = idx
+                append(new_idx)
+            new_idx = idx + right
+            if not visited[new_idx]:
+                visited[new_idx] = 1
+                parent[new_idx] = idx
+                append(new_idx)
+            
+            # Opsi 2: Pergerakan vertikal (pindah lantai) HANYA di posisi tangga
+            links = stair_links.get(idx)
+            if links:
+                for new_idx in links:
+                    if not visited[new_idx]:
+                        visited[new_idx] = 1
+                        parent[new_idx] = idx
+                        append(new_idx)
+        
+        return parent
+    
+    return _bfs_kernel
+
+
+def _energy_search_kernel(blocked: bytes, floor_size: int, cols: int, source_idx: int,
+                          offsets: List[int], stair_links: Dict[int, List[int]],
+                          energy_costs: Dict[str, float], target_idx: int = -1,
+                          use_heuristic: bool = False,
+                          target_mask: Optional[bytes] = None) -> Tuple[Dict, Dict[int, Tuple[int, int]]]:
+    """
+    Inti pencarian Dijkstra/A* pada grid pencarian berbingkai (blocked: 1 = dinding,
+    floor_size dan cols mengikuti ukuran berbingkai) dengan biaya energi sebagai bobot
+    langkah. Biaya boleh berupa integer (satuan terkuantisasi) maupun float.
+    State berupa (indeks sel, arah langkah terakhir) agar biaya belokan ikut dihitung;
+    arah dinyatakan sebagai selisih indeks sel (0 = belum bergerak).
+    Dengan target_idx pencarian berhenti saat target tercapai, dan use_heuristic
+    mengaktifkan heuristik A*. Dengan target_mask (Dijkstra) pencarian berhenti begitu
+    semua sel bertanda 1 sudah mendapat state termurah. Tanpa keduanya seluruh gedung
+    ditelusuri.
+    Mengembalikan parent untuk setiap state dan state termurah untuk setiap sel yang terjangkau.
+    """
+    base = energy_costs['base_pressure']
+    horizontal_cost = base + energy_costs['horizontal']
+    up_cost = base + energy_costs['vertical_up']
+    down_cost = base + energy_costs['vertical_down']
+    turn_cost = energy_costs['turn']
+    
+    # Heuristik admissible: setiap selisih baris/kolom butuh minimal satu langkah horizontal,
+    # dan selisih lantai butuh minimal satu kali naik atau turun (tangga bisa melompati lantai)
+    use_heuristic = use_heuristic and target_idx >= 0 and min(energy_costs.values()) >= 0
+    if use_heuristic:
+        target_f, rem = divmod(target_idx, floor_size)
+        target_r, target_c = divmod(rem, cols)
+    
+    start = (source_idx, 0)
+    best = {start: 0}
+    parent = {start: None}
+    settled = {}
+    remaining = target_mask.count(1) if target_mask is not None else -1
+    counter = 0
+    heap = [(0, counter, 0, source_idx, 0)]
+    
+    while heap:
+        _, _, energy, idx, prev_delta = heapq.heappop(heap)
+        state = (idx, prev_delta)
+        if energy > best[state]:
+            continue # Entri usang, state ini sudah ditemukan dengan energi lebih kecil
+        
+        # State pertama yang keluar dari heap untuk sebuah sel adalah yang termurah
+        if idx not in settled:
+            settled[idx] = state
+            if idx == target_idx:
+                break
+            if target_mask is not None and target_mask[idx]:
+                remaining -= 1
+                if not remaining:
+                    break # Semua target sudah memiliki jalur termurah
+        
+        # Opsi 1: Pergerakan horizontal di lantai yang sama
+        moves = []
+        for offset in offsets:
+            if not blocked[idx + offset]:
+                moves.append((idx + offset, offset, horizontal_cost))
+        
+        # Opsi 2: Pergerakan vertikal (pindah lantai) HANYA di posisi tangga
+        for new_idx in stair_links.get(idx, ()):
+            moves.append((new_idx, new_idx - idx, up_cost if new_idx > idx else down_cost))
+        
+        for new_idx, delta, step_cost in moves:
+            new_energy = energy + step_cost
+            if prev_delta and prev_delta != delta:
+                new_energy += turn_cost
+            new_state = (new_idx, delta)
+            if new_energy < best.get(new_state, float('inf')):
+                best[new_state] = new_energy
+                parent[new_state] = state
+                priority = new_energy
+                if use_heuristic:
+                    new_f, rem = divmod(new_idx, floor_size)
+                    new_r, new_c = divmod(rem, cols)
+                    priority += (abs(new_r - target_r) + abs(new_c - target_c)) * horizontal_cost
+                    if new_f < target_f:
+                        priority += up_cost
+                    elif new_f > target_f:
+                        priority += down_cost
+                counter += 1
+                heapq.heappush(heap, (priority, counter, new_energy, new_idx, delta))
+    
+    return parent, settled
+
 class ACPathfinder:
     def __init__(self, building_matrix: List[List[List[str]]]):
         """
@@ -17,11 +210,42 @@ class ACPathfinder:
         self.floors = len(building_matrix)
         self.rows = len(building_matrix[0]) if building_matrix else 0
         self.cols = len(building_matrix[0][0]) if building_matrix and building_matrix[0] else 0
+        self.floor_size = self.rows * self.cols
+        
+        # Grid datar di bawah mengandalkan bentuk balok: setiap lantai memiliki
+        # self.rows baris dan setiap baris self.cols sel
+        if any(len(floor) != self.rows or any(len(row) != self.cols for row in floor)
+               for floor in building_matrix):
+            raise ValueError("Setiap lantai harus memiliki jumlah baris dan kolom yang sama")
         
-        # Cari posisi sumber dan tujuan
-        self.source = self._find_position('S')
-        self.targets = self._find_all_positions('R')
-        self.stairs = self._find_all_positions('T')
+        # Salinan gedung sebagai grid byte datar berindeks (f * rows + r) * cols + c (lihat _index).
+        # Grid inilah yang dipakai untuk semua pengecekan sel; self.building hanya disimpan apa adanya
+        self.grid = bytearray(b"".join(
+            "".join(row).encode('ascii', 'replace') for floor in building_matrix for row in floor
+        ))
+        
+        # Grid pencarian memberi bingkai dinding satu sel di sekeliling setiap lantai,
+        # sehingga kernel pencarian tidak perlu memeriksa batas baris/kolom
+        self._search_cols = self.cols + 2
+        self._search_floor_size = (self.rows + 2) * self._search_cols
+        
+        # Cari posisi sumber, tujuan, dan tangga
+        self._scan_grid()
+        
+        # Mask dinding berbingkai (1 = dinding) dibuat sekali; kernel BFS cukup menyalinnya
+        # sebagai penanda sel yang sudah dikunjungi, kernel Dijkstra memakainya langsung
+        self._wall_mask = self._build_search_mask()
+        
+        # Mask ruangan tujuan (1 = target) pada grid pencarian, tetap selama gedung tidak berubah
+        target_mask = bytearray(len(self._wall_mask))
+        for idx in self._target_indices:
+            target_mask[idx] = 1
+        self._target_mask = bytes(target_mask)
+        
+        # Lantai-lantai yang memiliki tangga/lift untuk setiap koordinat (baris, kolom)
+        self.stairs_by_col = {}
+        for f, r, c in self.stairs:
+            self.stairs_by_col.setdefault((r, c), []).append(f)
         
         # Arah pergerakan: atas, bawah, kiri, kanan
         self.directions = [
@@ -31,6 +255,12 @@ class ACPathfinder:
             (0, 1)    # Kanan (kolom bertambah)
         ]
         
+        # Selisih indeks grid pencarian untuk setiap arah
+        self._search_offsets = [dr * self._search_cols + dc for dr, dc in self.directions]
+        
+        # Kernel BFS dengan selisih tetangga yang sudah tertanam untuk ukuran gedung ini
+        self._bfs = _make_bfs_kernel(tuple(self._search_offsets))
+        
         # Biaya energi untuk setiap jenis pergerakan
         self.energy_costs = {
             'horizontal': 1.0,      # Gerakan horizontal (kiri/kanan/atas/bawah di lantai sama)
@@ -39,24 +269,85 @@ class ACPathfinder:
             'turn': 0.5,           # Biaya tambahan untuk berbelok
             'base_pressure': 0.1    # Biaya dasar tekanan per unit panjang
         }
+        
+        # Biaya energi dihitung dalam satuan 1/10 agar akumulasi memakai integer
+        self._energy_scale = 10
+        
+        # Cache biaya terkuantisasi beserta salinan energy_costs yang menjadi sumbernya
+        self._quantized_source = None
+        self._quantized_costs = None
+        
+        # Peta posisi -> indeks jalur yang melewatinya, hanya terisi selama render blueprint
+        self._cell_paths = None
     
-    def _find_position(self, symbol: str) -> Optional[Tuple[int, int, int]]:
-        """Mencari posisi symbol tertentu dalam matriks"""
+    def _index(self, f: int, r: int, c: int) -> int:
+        """Mengubah koordinat (lantai, baris, kolom) menjadi indeks grid datar"""
+        return (f * self.rows + r) * self.cols + c
+    
+    def _coords(self, idx: int) -> Tuple[int, int, int]:
+        """Mengubah indeks grid datar menjadi koordinat (lantai, baris, kolom)"""
+        f, rem = divmod(idx, self.floor_size)
+        r, c = divmod(rem, self.cols)
+        return (f, r, c)
+    
+    def _search_index(self, f: int, r: int, c: int) -> int:
+        """Mengubah koordinat (lantai, baris, kolom) menjadi indeks grid pencarian berbingkai"""
+        return (f * (self.rows + 2) + r + 1) * self._search_cols + c + 1
+    
+    def _search_coords(self, idx: int) -> Tuple[int, int, int]:
+        """Mengubah indeks grid pencarian berbingkai menjadi koordinat (lantai, baris, kolom)"""
+        f, rem = divmod(idx, self._search_floor_size)
+        r, c = divmod(rem, self._search_cols)
+        return (f, r - 1, c - 1)
+    
+    def _build_search_mask(self) -> bytes:
+        """Membuat mask dinding grid pencarian: setiap lantai dikelilingi satu sel dinding"""
+        wall_mask = self.grid.translate(_WALL_MASK_TABLE)
+        cols = self.cols
+        border_row = b'\x01' * self._search_cols
+        pieces = []
         for f in range(self.floors):
+            pieces.append(border_row)
             for r in range(self.rows):
-                for c in range(self.cols):
-                    if self.building[f][r][c] == symbol:
-                        return (f, r, c)
-        return None
+                start = (f * self.rows + r) * cols
+                pieces.append(b'\x01' + wall_mask[start:start + cols] + b'\x01')
+            pieces.append(border_row)
+        return b"".join(pieces)
+    
+    def _scan_grid(self):
+        """Mencari sumber, semua ruangan tujuan, dan semua tangga dalam satu kali pemindaian grid"""
+        self.source = None
+        self.targets = []
+        self.stairs = []
+        # Indeks grid pencarian sumber dan tujuan disimpan juga agar tidak perlu dihitung ulang
+        self._source_idx = None
+        self._target_indices = []
+        for match in _MARKER_RE.finditer(self.grid):
+            idx = match.start()
+            pos = self._coords(idx)
+            symbol = match.group()
+            if symbol == b'R':
+                self.targets.append(pos)
+                self._target_indices.append(self._search_index(*pos))
+            elif symbol == b'T':
+                self.stairs.append(pos)
+            elif self.source is None:
+                self.source = pos
+                self._source_idx = self._search_index(*pos)
+    
+    def _find_position(self, symbol: str) -> Optional[Tuple[int, int, int]]:
+        """Mencari posisi symbol tertentu dalam matriks"""
+        idx = self.grid.find(ord(symbol))
+        return self._coords(idx) if idx >= 0 else None
     
     def _find_all_positions(self, symbol: str) -> List[Tuple[int, int, int]]:
         """Mencari semua posisi symbol tertentu dalam matriks"""
         positions = []
-        for f in range(self.floors):
-            for r in range(self.rows):
-                for c in range(self.cols):
-                    if self.building[f][r][c] == symbol:
-                        positions.append((f, r, c))
+        code = ord(symbol)
+        idx = self.grid.find(code)
+        while idx >= 0:
+            positions.append(self._coords(idx))
+            idx = self.grid.find(code, idx + 1)
         return positions
     
     def _is_valid_position(self, f: int, r: int, c: int) -> bool:
@@ -64,70 +355,71 @@ class ACPathfinder:
         return (0 <= f < self.floors and 
                 0 <= r < self.rows and 
                 0 <= c < self.cols and 
-                self.building[f][r][c] != 'W')
+                self.grid[(f * self.rows + r) * self.cols + c] != _WALL)
     
     def _can_change_floor(self, current_pos: Tuple[int, int, int], target_floor: int) -> bool:
         """Mengecek apakah bisa pindah lantai dari posisi current ke target floor"""
         f, r, c = current_pos
         
+        stair_floors = self.stairs_by_col.get((r, c), ())
+        
         # Harus ada tangga/lift di posisi current atau posisi yang akan dituju
-        if self.building[f][r][c] == 'T':
-            return True
-        
-        # Cek apakah ada tangga/lift di lantai tujuan dengan koordinat yang sama
-        if (0 <= target_floor < self.floors and 
-            0 <= r < self.rows and 
-            0 <= c < self.cols and
-            self.building[target_floor][r][c] == 'T'):
-            return True
-            
-        return False
+        # (di lantai tujuan dengan koordinat yang sama)
+        return f in stair_floors or target_floor in stair_floors
+    
+    def _quantized_energy_costs(self) -> Optional[Dict[str, int]]:
+        """
+        Mengubah biaya energi ke satuan integer 1/_energy_scale.
+        Mengembalikan None jika ada biaya yang bukan kelipatan satuan tersebut.
+        Hasilnya disimpan dan hanya dihitung ulang jika energy_costs berubah.
+        """
+        if self.energy_costs != self._quantized_source:
+            self._quantized_source = dict(self.energy_costs)
+            quantized = {}
+            for name, cost in self.energy_costs.items():
+                units = round(cost * self._energy_scale)
+                if abs(cost * self._energy_scale - units) > 1e-9:
+                    quantized = None
+                    break
+                quantized[name] = units
+            self._quantized_costs = quantized
+        return self._quantized_costs
     
     def _calculate_energy_cost(self, path: List[Tuple[int, int, int]]) -> float:
         """Menghitung total biaya energi untuk sebuah jalur"""
         if len(path) < 2:
             return 0.0
         
-        total_energy = 0.0
+        # Gunakan biaya integer jika memungkinkan agar total tidak terkena galat pembulatan float
+        quantized = self._quantized_energy_costs()
+        costs = quantized if quantized is not None else self.energy_costs
+        base = costs['base_pressure']
+        hc = costs['horizontal']
+        vup = costs['vertical_up']
+        vdn = costs['vertical_down']
+        tc = costs['turn']
         
-        for i in range(1, len(path)):
-            prev_pos = path[i-1]
-            curr_pos = path[i]
-            
-            prev_f, prev_r, prev_c = prev_pos
-            curr_f, curr_r, curr_c = curr_pos
-            
-            # Biaya dasar tekanan
-            total_energy += self.energy_costs['base_pressure']
-            
-            # Biaya pergerakan
+        # Setiap jenis pergerakan cukup dihitung jumlahnya dalam satu kali lintasan,
+        # lalu dikalikan dengan biayanya
+        up = down = turns = 0
+        prev_delta = None
+        prev_f, prev_r, prev_c = path[0]
+        for curr_f, curr_r, curr_c in path[1:]:
+            delta = (curr_f - prev_f, curr_r - prev_r, curr_c - prev_c)
             if curr_f != prev_f:
-                # Pergerakan vertikal (naik/turun lantai)
                 if curr_f > prev_f:
-                    total_energy += self.energy_costs['vertical_up']
+                    up += 1
                 else:
-                    total_energy += self.energy_costs['vertical_down']
-            else:
-                # Pergerakan horizontal
-                total_energy += self.energy_costs['horizontal']
-            
-            # Biaya berbelok
-            if i >= 2:
-                prev_prev_pos = path[i-2]
-                if self._is_turn(prev_prev_pos, prev_pos, curr_pos):
-                    total_energy += self.energy_costs['turn']
+                    down += 1
+            # Belokan terjadi jika arah dua langkah berurutan berbeda
+            if prev_delta is not None and delta != prev_delta:
+                turns += 1
+            prev_delta = delta
+            prev_f, prev_r, prev_c = curr_f, curr_r, curr_c
         
-        return total_energy
-    
-    def _is_turn(self, pos1: Tuple[int, int, int], pos2: Tuple[int, int, int], pos3: Tuple[int, int, int]) -> bool:
-        """Mengecek apakah terjadi belokan dari pos1 ke pos2 ke pos3"""
-        # Arah dari pos1 ke pos2
-        dir1 = (pos2[0] - pos1[0], pos2[1] - pos1[1], pos2[2] - pos1[2])
-        # Arah dari pos2 ke pos3
-        dir2 = (pos3[0] - pos2[0], pos3[1] - pos2[1], pos3[2] - pos2[2])
-        
-        # Jika arah berbeda, maka terjadi belokan
-        return dir1 != dir2
+        steps = len(path) - 1
+        total = steps * base + (steps - up - down) * hc + up * vup + down * vdn + turns * tc
+        return total / self._energy_scale if quantized is not None else total
     
     def _expand_path(self, path: List[Tuple[int, int, int]]) -> List[Tuple[int, int, int]]:
         """
@@ -153,18 +445,50 @@ class ACPathfinder:
             # Jika bergerak vertikal (atas/bawah) di lantai yang sama
             if c1 == c2:
                 step = 1 if r2 > r1 else -1
-                for r in range(r1 + step, r2, step):
-                    dense_path.append((f1, r, c1))
+                dense_path.extend(zip(repeat(f1), range(r1 + step, r2, step), repeat(c1)))
             # Jika bergerak horizontal (kiri/kanan) di lantai yang sama
             elif r1 == r2:
                 step = 1 if c2 > c1 else -1
-                for c in range(c1 + step, c2, step):
-                    dense_path.append((f1, r1, c))
+                dense_path.extend(zip(repeat(f1), repeat(r1), range(c1 + step, c2, step)))
             
             dense_path.append(end_pos)
         
         return dense_path
     
+    def _reconstruct_path(self, parent: List[int], target_cell: int) -> List[Tuple[int, int, int]]:
+        """Menyusun ulang jalur dari sumber ke indeks target dengan menelusuri parent secara mundur"""
+        floor_size, cols = self._search_floor_size, self._search_cols
+        idx = target_cell
+        path = [self._search_coords(idx)]
+        append = path.append
+        while parent[idx] != idx:
+            idx = parent[idx]
+            f, rem = divmod(idx, floor_size)
+            r, c = divmod(rem, cols)
+            append((f, r - 1, c - 1))
+        path.reverse()
+        return path
+    
+    def _build_stair_links(self) -> Dict[int, List[int]]:
+        """Menghubungkan setiap tangga ke tangga di lantai lain dengan posisi yang sama (indeks grid pencarian)"""
+        stair_links = {}
+        for (r, c), stair_floors in self.stairs_by_col.items():
+            for f in stair_floors:
+                stair_links[self._search_index(f, r, c)] = [
+                    self._search_index(new_f, r, c) for new_f in stair_floors if new_f != f
+                ]
+        return stair_links
+    
+    def _visual_path(self, path_info: Dict) -> List[Tuple[int, int, int]]:
+        """
+        Mengembalikan jalur padat untuk visualisasi. Hasil _expand_path disimpan
+        di path_info['visual_path'] sehingga setiap jalur hanya dipadatkan sekali.
+        """
+        visual_path = path_info.get('visual_path')
+        if visual_path is None:
+            visual_path = path_info['visual_path'] = self._expand_path(path_info['path'])
+        return visual_path
+    
     def bfs_pathfinding(self) -> List[Dict]:
         """
         Algoritma BFS untuk mencari jalur terpendek ke semua ruangan tujuan
@@ -173,58 +497,94 @@ class ACPathfinder:
         if not self.source or not self.targets:
             return []
         
+        # Satu kali BFS dari sumber sudah memberikan jalur terpendek ke semua sel,
+        # sehingga tidak perlu mengulang pencarian untuk setiap target.
+        parent = self._bfs(self._wall_mask, self._source_idx, self._target_mask, self._build_stair_links())
+        
         paths_to_all_targets = []
         
-        for target_idx, target in enumerate(self.targets):
-            # Antrian menyimpan: (posisi_sekarang, path_sejauh_ini)
-            queue = deque([(self.source, [self.source])])
-            visited = {self.source}
-            
-            path_found = False
-            
-            while queue:
-                current_pos, path = queue.popleft()
-                
-                # Jika target ditemukan
-                if current_pos == target:
-                    energy_cost = self._calculate_energy_cost(path)
-                    path_info = {
-                        'target_index': target_idx,
-                        'target_position': target,
-                        'path': path,
-                        'steps': len(path),
-                        'energy_cost': energy_cost
-                    }
-                    paths_to_all_targets.append(path_info)
-                    path_found = True
-                    break # Keluar dari while loop karena jalur ke target ini sudah ditemukan
-                
-                f, r, c = current_pos
-                
-                # Opsi 1: Pergerakan horizontal di lantai yang sama
-                for dr, dc in self.directions: # Menggunakan arah 2D
-                    new_r, new_c = r + dr, c + dc
-                    new_pos = (f, new_r, new_c) # Lantai (f) tetap sama
-                    
-                    if self._is_valid_position(f, new_r, new_c) and new_pos not in visited:
-                        visited.add(new_pos)
-                        new_path = path + [new_pos]
-                        queue.append((new_pos, new_path))
-                
-                # Opsi 2: Pergerakan vertikal (pindah lantai) HANYA di posisi tangga
-                if self.building[f][r][c] == 'T':
-                    for new_f in range(self.floors):
-                        if new_f != f: # Cek lantai lain
-                            # Pastikan di lantai tujuan juga ada tangga di posisi yang sama
-                            if self.building[new_f][r][c] == 'T':
-                                new_pos = (new_f, r, c)
-                                if new_pos not in visited:
-                                    visited.add(new_pos)
-                                    new_path = path + [new_pos]
-                                    queue.append((new_pos, new_path))
-
-            if not path_found:
+        for target_idx, (target, target_cell) in enumerate(zip(self.targets, self._target_indices)):
+            if parent[target_cell] < 0:
                 print(f"BFS: Tidak dapat menemukan jalur ke ruangan di {target}")
+                continue
+            
+            path = self._reconstruct_path(parent, target_cell)
+            paths_to_all_targets.append(self._make_path_info(target_idx, target, path))
+        
+        return paths_to_all_targets
+
+    def _state_path(self, parent: Dict, state: Tuple[int, int]) -> List[Tuple[int, int, int]]:
+        """Menyusun ulang jalur dari rantai parent state (indeks sel, arah) hasil pencarian energi"""
+        path = []
+        while state is not None:
+            path.append(self._search_coords(state[0]))
+            state = parent[state]
+        path.reverse()
+        return path
+    
+    def _make_path_info(self, target_idx: int, target: Tuple[int, int, int], path: List[Tuple[int, int, int]]) -> Dict:
+        """Membuat informasi jalur beserta biaya energinya"""
+        return {
+            'target_index': target_idx,
+            'target_position': target,
+            'path': path,
+            'steps': len(path),
+            'energy_cost': self._calculate_energy_cost(path)
+        }
+    
+    def dijkstra_pathfinding(self) -> List[Dict]:
+        """
+        Algoritma Dijkstra untuk mencari jalur dengan biaya energi minimum
+        (bukan jumlah langkah minimum seperti BFS) ke semua ruangan tujuan.
+        Biaya setiap langkah mengikuti model yang sama dengan _calculate_energy_cost.
+        """
+        if not self.source or not self.targets:
+            return []
+        
+        # Biaya integer membuat perbandingan energi di heap eksak
+        energy_costs = self._quantized_energy_costs() or self.energy_costs
+        # Satu kali penelusuran sudah mencakup semua target dan berhenti begitu semuanya tercapai
+        parent, settled = _energy_search_kernel(self._wall_mask, self._search_floor_size, self._search_cols,
+                                                self._source_idx, self._search_offsets,
+                                                self._build_stair_links(), energy_costs,
+                                                target_mask=self._target_mask)
+        
+        paths_to_all_targets = []
+        
+        for target_idx, (target, target_cell) in enumerate(zip(self.targets, self._target_indices)):
+            state = settled.get(target_cell)
+            if state is None:
+                print(f"Dijkstra: Tidak dapat menemukan jalur ke ruangan di {target}")
+                continue
+            paths_to_all_targets.append(self._make_path_info(target_idx, target, self._state_path(parent, state)))
+        
+        return paths_to_all_targets
+
+    def a_star_pathfinding(self, use_heuristic: bool = True) -> List[Dict]:
+        """
+        Algoritma A* berbasis energi untuk setiap ruangan tujuan, dengan heuristik
+        jarak Manhattan (baris/kolom) ditambah satu kali naik/turun jika lantainya berbeda.
+        Dengan use_heuristic=False heuristiknya 0 sehingga sama dengan Dijkstra per target.
+        Unggul untuk satu ruangan tujuan; untuk beberapa target sekaligus dijkstra_pathfinding
+        (satu penelusuran dengan penghentian dini) lebih cepat.
+        """
+        if not self.source or not self.targets:
+            return []
+        
+        energy_costs = self._quantized_energy_costs() or self.energy_costs
+        stair_links = self._build_stair_links()
+        
+        paths_to_all_targets = []
+        
+        for target_idx, (target, target_cell) in enumerate(zip(self.targets, self._target_indices)):
+            parent, settled = _energy_search_kernel(self._wall_mask, self._search_floor_size, self._search_cols,
+                                                    self._source_idx, self._search_offsets, stair_links,
+                                                    energy_costs, target_cell, use_heuristic)
+            state = settled.get(target_cell)
+            if state is None:
+                print(f"A*: Tidak dapat menemukan jalur ke ruangan di {target}")
+                continue
+            paths_to_all_targets.append(self._make_path_info(target_idx, target, self._state_path(parent, state)))
         
         return paths_to_all_targets
 
@@ -244,11 +604,13 @@ class ACPathfinder:
             
             # Gunakan jalur yang lebih efisien
             if optimized_energy < original_energy:
-                optimized_info = path_info.copy()
-                optimized_info['path'] = optimized_path
-                optimized_info['energy_cost'] = optimized_energy
-                optimized_info['steps'] = len(optimized_path)
-                optimized_info['energy_saved'] = original_energy - optimized_energy
+                optimized_info = {
+                    **path_info,
+                    'path': optimized_path,
+                    'energy_cost': optimized_energy,
+                    'steps': len(optimized_path),
+                    'energy_saved': original_energy - optimized_energy
+                }
                 optimized_paths.append(optimized_info)
             else:
                 path_info['energy_saved'] = 0.0
@@ -264,6 +626,7 @@ class ACPathfinder:
             return path
         
         optimized = [path[0]]
+        can_go_direct = self._can_go_direct
         
         for i in range(1, len(path) - 1):
             prev_pos = optimized[-1]
@@ -271,7 +634,7 @@ class ACPathfinder:
             next_pos = path[i + 1]
             
             # Cek apakah bisa langsung ke next_pos tanpa melalui curr_pos
-            if self._can_go_direct(prev_pos, next_pos):
+            if can_go_direct(prev_pos, next_pos):
                 # Skip curr_pos jika memungkinkan
                 continue
             else:
@@ -295,29 +658,30 @@ class ACPathfinder:
         if (r1 != r2 and c1 != c2):
             return False
         
-        # Cek apakah ada halangan di antara pos1 dan pos2
-        if r1 == r2:  # Pergerakan horizontal
-            start_c = min(c1, c2)
-            end_c = max(c1, c2)
-            for c in range(start_c + 1, end_c):
-                if not self._is_valid_position(f1, r1, c):
-                    return False
-        else:  # Pergerakan vertikal
-            start_r = min(r1, r2)
-            end_r = max(r1, r2)
-            for r in range(start_r + 1, end_r):
-                if not self._is_valid_position(f1, r, c1):
-                    return False
-        
-        return True
+        # Cek apakah ada halangan di antara pos1 dan pos2 dengan memotong grid datar
+        if r1 == r2:  # Pergerakan horizontal: sel-sel di antaranya bersebelahan di grid
+            start = self._index(f1, r1, min(c1, c2))
+            end = self._index(f1, r1, max(c1, c2))
+            between = self.grid[start + 1:end]
+        else:  # Pergerakan vertikal: sel-sel di antaranya berjarak satu baris (self.cols)
+            start = self._index(f1, min(r1, r2), c1)
+            end = self._index(f1, max(r1, r2), c1)
+            between = self.grid[start + self.cols:end:self.cols]
+        
+        return _WALL not in between
     
     def print_building(self):
         """Menampilkan representasi gedung"""
-        print("=== DENAH GEDUNG ===")
+        # Susun seluruh denah terlebih dahulu lalu tulis sekaligus
+        lines = ["=== DENAH GEDUNG ==="]
         for f in range(self.floors):
-            print(f"\nLantai {f + 1}:")
-            for r in range(self.rows):
-                print(" ".join(self.building[f][r]))
+            lines.append(f"\nLantai {f + 1}:")
+            start = f * self.floor_size
+            lines.extend(
+                " ".join(self.grid[row_start:row_start + self.cols].decode('ascii'))
+                for row_start in range(start, start + self.floor_size, self.cols)
+            )
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def print_path_with_energy(self, path_info: Dict, algorithm: str):
         """Menampilkan jalur yang ditemukan dengan informasi energi"""
@@ -339,15 +703,7 @@ class ACPathfinder:
         
         print("Koordinat jalur (Lantai, Baris, Kolom):")
         for i, (f, r, c) in enumerate(path):
-            cell_type = self.building[f][r][c]
-            type_desc = ""
-            if cell_type == 'S':
-                type_desc = " [Sumber AC]"
-            elif cell_type == 'R':
-                type_desc = " [Ruangan Tujuan]"
-            elif cell_type == 'T':
-                type_desc = " [Tangga/Lift]"
-            
+            type_desc = _CELL_DESCRIPTIONS.get(self.grid[self._index(f, r, c)], "")
             print(f"  {i + 1}. Lantai {f + 1}, Baris {r + 1}, Kolom {c + 1}{type_desc}")
     
     def create_professional_blueprint(self, paths_info: List[Dict], algorithm: str):
@@ -359,85 +715,85 @@ class ACPathfinder:
             print(f"\n{algorithm}: Tidak ada jalur untuk divisualisasikan")
             return
 
-        print(f"\n{'='*80}")
-        print(f"BLUEPRINT INSTALASI PIPA AC - {algorithm}".center(80))
-        print(f"{'='*80}")
+        # Seluruh blueprint ditampung dulu lalu ditulis ke stdout sekaligus
+        out = io.StringIO()
+        print(f"\n{'='*80}", file=out)
+        print(f"BLUEPRINT INSTALASI PIPA AC - {algorithm}".center(80), file=out)
+        print(f"{'='*80}", file=out)
 
-        # Gabungkan semua koordinat path untuk memudahkan pengecekan
-        all_path_coords = set()
-        for info in paths_info:
-            # Pastikan menggunakan visual_path jika ada
-            path_to_use = info.get('visual_path', info['path'])
-            for pos in path_to_use:
-                all_path_coords.add(pos)
+        # Pastikan menggunakan jalur padat (visual_path) untuk visualisasi
+        visual_paths = [self._visual_path(info) for info in paths_info]
         
-        for floor_idx in range(self.floors):
-            self._draw_floor_blueprint_revised(floor_idx, paths_info, all_path_coords)
+        # Indeks setiap posisi di dalam jalurnya, dibuat sekali per jalur
+        idx_maps = [self._build_index_map(path) for path in visual_paths]
         
-        self._draw_energy_legend(paths_info, [])
+        # Jalur yang melewati setiap sel, dipakai oleh _get_path_info selama render
+        self._cell_paths = self._build_cell_paths(visual_paths)
+        try:
+            for floor_idx in range(self.floors):
+                self._draw_floor_blueprint_revised(floor_idx, visual_paths, idx_maps, out)
+            
+            self._draw_energy_legend(paths_info, [], out)
+        finally:
+            self._cell_paths = None
+        
+        sys.stdout.write(out.getvalue())
 
-    def _draw_floor_blueprint_revised(self, floor_idx: int, paths_info: List[Dict], all_path_coords: set):
-        """Menggambar blueprint untuk satu lantai dengan format yang padat dan rapi."""
-        print(f"\n--- LANTAI {floor_idx + 1} ---")
+    def _build_index_map(self, path: List[Tuple[int, int, int]]) -> Dict[Tuple[int, int, int], int]:
+        """Memetakan setiap posisi ke indeks kemunculan pertamanya di dalam jalur"""
+        idx_map = {}
+        for i, pos in enumerate(path):
+            idx_map.setdefault(pos, i)
+        return idx_map
+    
+    def _draw_floor_blueprint_revised(self, floor_idx: int, paths: List[List[Tuple[int, int, int]]],
+                                      idx_maps: List[Dict[Tuple[int, int, int], int]], out: TextIO):
+        """Menggambar blueprint untuk satu lantai dengan format yang padat dan rapi ke out."""
+        print(f"\n--- LANTAI {floor_idx + 1} ---", file=out)
 
         # Buat canvas dasar untuk lantai ini
         # Setiap sel akan direpresentasikan sebagai satu karakter
-        canvas = [[' ' for _ in range(self.cols)] for _ in range(self.rows)]
-
-        # 1. Gambar elemen dasar gedung (Tembok, Ruangan, dll.)
-        for r in range(self.rows):
-            for c in range(self.cols):
-                symbol = self.building[floor_idx][r][c]
-                if symbol == 'W':
-                    canvas[r][c] = '█'
-                elif symbol == 'S':
-                    canvas[r][c] = 'S'
-                elif symbol == 'R':
-                    canvas[r][c] = 'R'
-                elif symbol == 'T':
-                    canvas[r][c] = 'T'
-                elif (floor_idx, r, c) not in all_path_coords:
-                     canvas[r][c] = '·'
+        # 1. Gambar elemen dasar gedung (Tembok, Ruangan, dll.) langsung dari grid dengan
+        #    tabel terjemahan; sel kosong yang dilalui pipa akan ditimpa pada langkah 2
+        start = floor_idx * self.floor_size
+        canvas = [
+            list(self.grid[row_start:row_start + self.cols].decode('ascii').translate(_CANVAS_TABLE))
+            for row_start in range(start, start + self.floor_size, self.cols)
+        ]
 
         # 2. Gambar jalur pipa di atas canvas
-        for info in paths_info:
-            path = info.get('visual_path', info['path'])
-            for i, pos in enumerate(path):
+        for path, idx_map in zip(paths, idx_maps):
+            for pos in path:
                 f, r, c = pos
                 if f == floor_idx:
                     # Dapatkan karakter pipa yang sesuai (belokan, lurus, dll.)
-                    path_char = self._get_path_char_for_pos(pos, path)
+                    path_char = self._get_path_char_for_pos(pos, path, idx_map)
                     canvas[r][c] = path_char
 
         # 3. Cetak canvas ke terminal dengan border dan nomor
         # Header kolom
         header = "    " + "".join([f"{c+1:^3}" for c in range(self.cols)])
-        print(header)
-        print("  ┌" + "─" * (self.cols * 3) + "┐")
+        print(header, file=out)
+        print("  ┌" + "─" * (self.cols * 3) + "┐", file=out)
 
         for r in range(self.rows):
-            row_str = f"{r+1:<2}│"
-            for c in range(self.cols):
-                char = canvas[r][c]
-                # Beri warna untuk membedakan elemen (opsional, butuh library seperti colorama)
-                row_str += f" {char} "
-            row_str += "│"
-            print(row_str)
+            # Setiap sel selebar 3 karakter: " X "
+            print(f"{r+1:<2}│ " + "  ".join(canvas[r]) + " │", file=out)
         
-        print("  └" + "─" * (self.cols * 3) + "┘")
+        print("  └" + "─" * (self.cols * 3) + "┘", file=out)
 
-    def _get_path_char_for_pos(self, pos: Tuple[int, int, int], path: List[Tuple[int, int, int]]) -> str:
+    def _get_path_char_for_pos(self, pos: Tuple[int, int, int], path: List[Tuple[int, int, int]],
+                               idx_map: Dict[Tuple[int, int, int], int]) -> str:
         """Menentukan karakter pipa yang tepat (lurus, belokan, dll.) untuk sebuah posisi."""
         f, r, c = pos
         
         # Jika posisi adalah Sumber, Ruangan, atau Tangga, prioritaskan simbol itu
-        symbol = self.building[f][r][c]
-        if symbol in ('S', 'R', 'T'):
-            return symbol
+        symbol = self.grid[self._index(f, r, c)]
+        if symbol in _MARKER_CODES:
+            return chr(symbol)
 
-        try:
-            idx = path.index(pos)
-        except ValueError:
+        idx = idx_map.get(pos)
+        if idx is None:
             return '·' # Seharusnya tidak terjadi
 
         # Cek koneksi ke titik sebelum dan sesudahnya
@@ -479,10 +835,10 @@ class ACPathfinder:
         return '·' # Fallback
     
     
-    def _get_cell_content(self, floor_idx: int, row: int, col: int, paths: List[List[Tuple[int, int, int]]], path_styles: List[Tuple[str]], line: int) -> str:
+    def _get_cell_content(self, floor_idx: int, row: int, col: int, paths: List[List[Tuple[int, int, int]]], idx_maps: List[Dict[Tuple[int, int, int], int]], path_styles: List[Tuple[str]], line: int) -> str:
         """Mendapatkan konten untuk sebuah sel dengan prioritas pada ikon dan padding yang benar."""
         cell_width = 8
-        cell = self.building[floor_idx][row][col]
+        cell = chr(self.grid[self._index(floor_idx, row, col)])
         path_info = self._get_path_info(floor_idx, row, col, paths)
 
         if line == 1:  # Baris tengah sel, tempat konten utama
@@ -494,15 +850,15 @@ class ACPathfinder:
             
             # Prioritas 2: Jika bukan lokasi penting, gambar jalur pipa
             if path_info:
-                return self._draw_path_connections(floor_idx, row, col, paths, path_styles)
+                return self._draw_path_connections(floor_idx, row, col, paths, idx_maps, path_styles)
 
             # Prioritas 3: Jika tidak ada apa-apa, gambar area kosong
             return f"   ·    "
 
         # Gambar koneksi vertikal untuk jalur pipa
         elif (line == 0 or line == 2) and path_info:
-            connections_up = self._has_vertical_connection(floor_idx, row, col, paths, is_top=True)
-            connections_down = self._has_vertical_connection(floor_idx, row, col, paths, is_top=False)
+            connections_up = self._has_vertical_connection(floor_idx, row, col, idx_maps, is_top=True)
+            connections_down = self._has_vertical_connection(floor_idx, row, col, idx_maps, is_top=False)
             if (line == 0 and connections_up) or (line == 2 and connections_down):
                 path_idx = path_info[0]
                 # Ambil karakter vertikal dari style
@@ -512,15 +868,25 @@ class ACPathfinder:
         
         return " " * cell_width
     
+    def _build_cell_paths(self, paths: List[List[Tuple[int, int, int]]]) -> Dict[Tuple[int, int, int], List[int]]:
+        """Memetakan setiap posisi ke daftar indeks jalur yang melewatinya"""
+        cell_paths = {}
+        for i, path in enumerate(paths):
+            for pos in path:
+                path_indices = cell_paths.setdefault(pos, [])
+                if not path_indices or path_indices[-1] != i:
+                    path_indices.append(i)
+        return cell_paths
+    
     def _get_path_info(self, floor_idx: int, row: int, col: int, paths: List[List[Tuple[int, int, int]]]) -> Optional[List[int]]:
         """Mendapatkan informasi jalur yang melewati posisi ini"""
-        path_indices = []
-        for i, path in enumerate(paths):
-            if (floor_idx, row, col) in path:
-                path_indices.append(i)
-        return path_indices if path_indices else None
+        cell_paths = self._cell_paths
+        if cell_paths is None:
+            # Di luar render blueprint belum ada cache, bangun dari jalur yang diberikan
+            cell_paths = self._build_cell_paths(paths)
+        return cell_paths.get((floor_idx, row, col))
     
-    def _draw_path_connections(self, floor_idx: int, row: int, col: int, paths: List[List[Tuple[int, int, int]]], path_styles: List[Tuple[str]]) -> str:
+    def _draw_path_connections(self, floor_idx: int, row: int, col: int, paths: List[List[Tuple[int, int, int]]], idx_maps: List[Dict[Tuple[int, int, int], int]], path_styles: List[Tuple[str]]) -> str:
         """Menggambar koneksi jalur dengan padding yang benar untuk memastikan lebar 8 karakter."""
         path_nums = self._get_path_info(floor_idx, row, col, paths)
         
@@ -535,7 +901,7 @@ class ACPathfinder:
         # Cek koneksi untuk SEMUA jalur yang melewati sel ini
         for path_idx in path_nums:
             path = paths[path_idx]
-            pos_index = path.index((floor_idx, row, col))
+            pos_index = idx_maps[path_idx][(floor_idx, row, col)]
             
             if pos_index > 0:
                 prev_f, prev_r, prev_c = path[pos_index - 1]
@@ -575,27 +941,26 @@ class ACPathfinder:
         core_content = f"{left}{mid}{right}"
         return f" {core_content} "
     
-    def _has_vertical_connection(self, floor_idx: int, row: int, col: int, paths: List[List[Tuple[int, int, int]]], is_top: bool) -> bool:
+    def _has_vertical_connection(self, floor_idx: int, row: int, col: int, idx_maps: List[Dict[Tuple[int, int, int], int]], is_top: bool) -> bool:
         """Cek apakah ada koneksi vertikal ke atas atau ke bawah dari sel ini."""
         target_row = row - 1 if is_top else row + 1
         
-        for path in paths:
-            try:
-                # Cek apakah posisi saat ini dan posisi target (atas/bawah) ada di jalur yang sama
-                current_pos_index = path.index((floor_idx, row, col))
-                target_pos_index = path.index((floor_idx, target_row, col))
-                
-                # Pastikan mereka bersebelahan di dalam path
-                if abs(current_pos_index - target_pos_index) == 1:
-                    return True
-            except ValueError:
+        for idx_map in idx_maps:
+            # Cek apakah posisi saat ini dan posisi target (atas/bawah) ada di jalur yang sama
+            current_pos_index = idx_map.get((floor_idx, row, col))
+            target_pos_index = idx_map.get((floor_idx, target_row, col))
+            if current_pos_index is None or target_pos_index is None:
                 # Salah satu posisi tidak ada di jalur ini, lanjutkan ke path berikutnya
                 continue
+            
+            # Pastikan mereka bersebelahan di dalam path
+            if abs(current_pos_index - target_pos_index) == 1:
+                return True
         return False
     
-    def _draw_energy_legend(self, paths_info: List[Dict], path_styles: List[str]):
+    def _draw_energy_legend(self, paths_info: List[Dict], path_styles: List[str], out: TextIO):
         """
-        Menggambar legend blueprint dengan informasi energi dalam format tabel yang rapi.
+        Menggambar legend blueprint dengan informasi energi dalam format tabel yang rapi ke out.
         (Versi Revisi 2)
         """
         # --- Helper Function untuk mencetak baris dengan border ---
@@ -604,19 +969,19 @@ class ACPathfinder:
                 content = text.center(width)
             else:
                 content = text.ljust(width)
-            print(f"│ {content} │")
+            print(f"│ {content} │", file=out)
 
         def print_separator(width=76):
-            print(f"├{'─' * (width + 2)}┤")
+            print(f"├{'─' * (width + 2)}┤", file=out)
         
         WIDTH = 76
         
-        print(f"\n{'='*80}")
-        print("KETERANGAN BLUEPRINT & ANALISIS ENERGI".center(80))
-        print(f"{'='*80}")
+        print(f"\n{'='*80}", file=out)
+        print("KETERANGAN BLUEPRINT & ANALISIS ENERGI".center(80), file=out)
+        print(f"{'='*80}", file=out)
         
         # --- Gambar Tabel ---
-        print(f"┌{'─' * (WIDTH + 2)}┐")
+        print(f"┌{'─' * (WIDTH + 2)}┐", file=out)
         
         print_line("LEGENDA SIMBOL", align='center', width=WIDTH)
         print_separator(width=WIDTH)
@@ -635,7 +1000,7 @@ class ACPathfinder:
         total_steps = 0
         for i, path_info in enumerate(paths_info):
             energy = path_info['energy_cost']
-            steps = len(path_info.get('visual_path', path_info['path']))
+            steps = len(self._visual_path(path_info))
             efficiency = energy / steps if steps > 0 else 0
             
             info_text = f"Jalur ke Ruangan @{path_info['target_position']}: {steps} langkah, {energy:.1f} unit energi (efisiensi: {efficiency:.2f})"
@@ -668,7 +1033,7 @@ class ACPathfinder:
         print_line(f"Jumlah Ruangan: {len(paths_info)}", width=WIDTH)
         print_line(f"Jumlah Lantai: {self.floors} | Dimensi: {self.rows}x{self.cols} | Tangga/Lift: {len(self.stairs)}", width=WIDTH)
 
-        print(f"└{'─' * (WIDTH + 2)}┘")
+        print(f"└{'─' * (WIDTH + 2)}┘", file=out)
 
 
 def read_building_from_file(filepath: str) -> List[List[List[str]]]:
@@ -677,34 +1042,36 @@ def read_building_from_file(filepath: str) -> List[List[List[str]]]:
     dan mengabaikan baris yang bukan bagian dari denah.
     """
     building = []
-    map_chars = {'S', 'R', 'T', 'W', '.'}
     try:
+        # Baca seluruh file sekaligus, lalu pecah per baris
         with open(filepath, 'r') as f:
-            floor_data = []
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                # Jika baris adalah pemisah lantai
-                if line == '---':
-                    if floor_data:
-                        building.append(floor_data)
-                    floor_data = []
-                    continue
-
-                # Proses hanya baris yang terlihat seperti denah
-                # Ambil bagian akhir dari baris (setelah ']' jika ada)
-                if ']' in line:
-                    line = line.split(']', 1)[-1].strip()
-
-                # Buat baris denah dari karakter yang valid
-                row = [char for char in line.replace(" ", "") if char in map_chars]
-                if row: # Hanya tambahkan jika baris tidak kosong setelah dibersihkan
-                    floor_data.append(row)
-
-            if floor_data:
-                building.append(floor_data)
+            lines = f.read().splitlines()
+
+        floor_data = []
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            
+            # Jika baris adalah pemisah lantai
+            if line == '---':
+                if floor_data:
+                    building.append(floor_data)
+                floor_data = []
+                continue
+
+            # Proses hanya baris yang terlihat seperti denah
+            # Ambil bagian akhir dari baris (setelah ']' jika ada)
+            if ']' in line:
+                line = line.split(']', 1)[-1]
+
+            # Buat baris denah dari karakter yang valid (spasi ikut terhapus)
+            row = list(line.translate(_MAP_CHAR_TABLE))
+            if row: # Hanya tambahkan jika baris tidak kosong setelah dibersihkan
+                floor_data.append(row)
+
+        if floor_data:
+            building.append(floor_data)
     except FileNotFoundError:
         print(f"Error: File tidak ditemukan di '{filepath}'")
         return []
@@ -716,82 +1083,107 @@ def read_building_from_file(filepath: str) -> List[List[List[str]]]:
         return []
 
     # (Sisa fungsi ini sama seperti sebelumnya, untuk meratakan kolom)
-    max_cols = 0
-    for floor in building:
-        for row in floor:
-            if len(row) > max_cols:
-                max_cols = len(row)
+    max_cols = max(len(row) for floor in building for row in floor)
+    max_rows = max(len(floor) for floor in building)
 
-    sanitized_building = []
+    # Baris yang lebih pendek dilengkapi di tempat; baris yang sudah penuh tidak disentuh
     for floor in building:
-        sanitized_floor = []
         for row in floor:
             current_len = len(row)
             if current_len < max_cols:
-                row.extend(['.'] * (max_cols - current_len))
-            sanitized_floor.append(row)
-        sanitized_building.append(sanitized_floor)
+                row.extend(repeat('.', max_cols - current_len))
+        # Lantai yang lebih pendek dilengkapi dengan baris area kosong
+        for _ in range(max_rows - len(floor)):
+            floor.append(['.'] * max_cols)
     
-    return sanitized_building
+    return building
 
 # --- Main execution block ---
 if __name__ == "__main__":
-    building_layout_file = None # Inisialisasi variabel nama file
+    parser = argparse.ArgumentParser(description="Mencari jalur pipa AC dengan energi minimum pada denah gedung.")
+    parser.add_argument('files', nargs='*', metavar='FILE',
+                        help="file denah gedung; beberapa file diproses berurutan dalam satu kali jalan")
+    parser.add_argument('--energi-optimal', action='store_true',
+                        help="cari jalur berbiaya energi minimum dengan Dijkstra berbasis energi "
+                             "(jauh lebih lambat) alih-alih BFS lalu optimasi energi")
+    args = parser.parse_args()
 
     # Periksa apakah nama file diberikan sebagai argumen baris perintah
-    if len(sys.argv) > 1:
-        building_layout_file = sys.argv[1]
-        print(f"[INFO] Memuat denah dari argumen: '{building_layout_file}'")
+    if args.files:
+        building_layout_files = args.files
     else:
         try:
-            building_layout_file = input("Masukkan nama file denah gedung (contoh: denah.txt): ")
+            building_layout_files = [input("Masukkan nama file denah gedung (contoh: denah.txt): ")]
         except KeyboardInterrupt:
             print("\nProses dibatalkan oleh pengguna. Keluar.")
             sys.exit(0)
 
-    # Pastikan nama file tidak kosong
-    if not building_layout_file:
-        print("Error: Tidak ada nama file yang diberikan. Program berhenti.")
-        sys.exit(1)
+        # Pastikan nama file tidak kosong; pada mode batch entri yang buruk cukup dilewati
+        if not building_layout_files[0]:
+            print("Error: Tidak ada nama file yang diberikan. Program berhenti.")
+            sys.exit(1)
 
-    # Baca dan buat matriks gedung dari file yang sudah ditentukan
-    building_matrix = read_building_from_file(building_layout_file)
-    
-    if not building_matrix:
-        print("Gagal memuat denah gedung. Pastikan nama file benar dan file ada. Program berhenti.")
-    else:
+    for building_layout_file in building_layout_files:
+        if args.files:
+            print(f"[INFO] Memuat denah dari argumen: '{building_layout_file}'")
+
+        # Baca dan buat matriks gedung dari file yang sudah ditentukan
+        building_matrix = read_building_from_file(building_layout_file)
+        
+        if not building_matrix:
+            # Pada mode batch, denah yang gagal dimuat dilewati dan file berikutnya tetap diproses
+            outcome = "Denah dilewati." if len(building_layout_files) > 1 else "Program berhenti."
+            print(f"Gagal memuat denah gedung. Pastikan nama file benar dan file ada. {outcome}")
+            continue
+        
         # Inisialisasi Pathfinder
-        pathfinder = ACPathfinder(building_matrix)
+        try:
+            pathfinder = ACPathfinder(building_matrix)
+        except ValueError as e:
+            outcome = "Denah dilewati." if len(building_layout_files) > 1 else "Program berhenti."
+            print(f"Error: {e}. {outcome}")
+            continue
         
         # Tampilkan denah gedung awal
         pathfinder.print_building()
         
-        # 1. Jalankan algoritma BFS untuk mencari jalur
-        print("\n[INFO] Menjalankan algoritma BFS untuk mencari jalur awal...")
-        start_time = time.time()
-        bfs_paths = pathfinder.bfs_pathfinding()
-        end_time = time.time()
-        print(f"[INFO] BFS selesai dalam {end_time - start_time:.4f} detik.")
-        
-        if bfs_paths:
-            # 2. Jalankan optimasi energi
-            print("\n[INFO] Menjalankan optimasi energi pada jalur yang ditemukan...")
-            start_time = time.time()
-            optimized_paths_info = pathfinder.optimize_energy_usage(bfs_paths)
-            end_time = time.time()
-            print(f"[INFO] Optimasi selesai dalam {end_time - start_time:.4f} detik.")
+        if args.energi_optimal:
+            # Cari jalur dengan energi minimum secara langsung; biaya energi sudah menjadi
+            # bobot langkah di dalam pencarian sehingga tidak perlu tahap optimasi terpisah
+            start_time = time.perf_counter_ns()
+            if len(pathfinder.targets) == 1:
+                # Untuk satu ruangan tujuan, heuristik A* memangkas sebagian besar state
+                print("\n[INFO] Menjalankan algoritma A* berbasis energi untuk mencari jalur optimal...")
+                optimized_paths_info = pathfinder.a_star_pathfinding()
+            else:
+                print("\n[INFO] Menjalankan algoritma Dijkstra berbasis energi untuk mencari jalur optimal...")
+                optimized_paths_info = pathfinder.dijkstra_pathfinding()
+            end_time = time.perf_counter_ns()
+            print(f"[INFO] Pencarian jalur selesai dalam {(end_time - start_time) / 1e9:.4f} detik.")
+        else:
+            # 1. Jalankan algoritma BFS untuk mencari jalur
+            print("\n[INFO] Menjalankan algoritma BFS untuk mencari jalur awal...")
+            start_time = time.perf_counter_ns()
+            bfs_paths = pathfinder.bfs_pathfinding()
+            end_time = time.perf_counter_ns()
+            print(f"[INFO] BFS selesai dalam {(end_time - start_time) / 1e9:.4f} detik.")
             
-            # Tampilkan detail jalur setelah optimasi
-            # Tampilkan detail jalur setelah optimasi
+            optimized_paths_info = []
+            if bfs_paths:
+                # 2. Jalankan optimasi energi
+                print("\n[INFO] Menjalankan optimasi energi pada jalur yang ditemukan...")
+                start_time = time.perf_counter_ns()
+                optimized_paths_info = pathfinder.optimize_energy_usage(bfs_paths)
+                end_time = time.perf_counter_ns()
+                print(f"[INFO] Optimasi selesai dalam {(end_time - start_time) / 1e9:.4f} detik.")
+        
+        if optimized_paths_info:
+            # Tampilkan detail jalur optimal
             for path_info in optimized_paths_info:
                  pathfinder.print_path_with_energy(path_info, "Jalur Optimal")
 
-            # "Padatkan" setiap jalur yang sudah dioptimasi untuk visualisasi
-            for info in optimized_paths_info:
-                info['visual_path'] = pathfinder._expand_path(info['path'])
-                 
-            # Buat blueprint profesional HANYA untuk hasil optimasi
+            # Buat blueprint profesional untuk jalur optimal
             pathfinder.create_professional_blueprint(optimized_paths_info, "BLUEPRINT HASIL OPTIMASI")
 
         else:
-            print("\n[AKHIR] Tidak ada jalur yang ditemukan dari sumber ke ruangan tujuan.")
\ No newline at end of file
+            print("\n[AKHIR] Tidak ada jalur yang ditemukan dari sumber ke ruangan tujuan.")